@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Review Memory Benchmark for TrustProof Backend
+Compares bytes per review of the old dict-per-review layout with ReviewStore
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from trustproof_backend import ReviewRecord, ReviewStore
+
+REVIEW_COUNT = 50_000
+BUSINESS_COUNT = 200
+
+def sample_reviews(count):
+    """Fresh string objects per review, as they arrive from parsed JSON"""
+    rng = random.Random(42)
+    words = ["great", "room", "staff", "food", "clean", "slow", "friendly", "price", "view", "noisy"]
+    for i in range(count):
+        business = rng.randrange(BUSINESS_COUNT)
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(15, 40)))
+        yield (
+            f"{i:012x}",
+            "".join(["BIZ-", f"{business:05d}"]),
+            f"BILL-2024-{i:06d}",
+            text,
+            bool(i % 2)
+        )
+
+def measure(build):
+    """Bytes retained per review, including the review text itself"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = build(sample_reviews(REVIEW_COUNT))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return store, (after - before) / REVIEW_COUNT
+
+def build_dict_store(reviews):
+    store = {}
+    for review_id, business_id, bill_id, text, media_uploaded in reviews:
+        store[review_id] = {
+            "business_id": business_id,
+            "bill_id": bill_id,
+            "review_text": text,
+            "media_uploaded": media_uploaded,
+            "timestamp": datetime.now().isoformat()
+        }
+    return store
+
+def build_review_store(reviews):
+    # Default TTL, so the per-review expiry heap entry is measured too
+    store = ReviewStore(memory_cap_bytes=sys.maxsize)
+    now = int(time.time())
+    for review_id, business_id, bill_id, text, media_uploaded in reviews:
+        store.add(review_id, ReviewRecord(business_id, bill_id, text, media_uploaded, now))
+    return store
+
+def main():
+    print("=" * 60)
+    print(f"📏 Review memory benchmark ({REVIEW_COUNT:,} reviews, {BUSINESS_COUNT} businesses)")
+    print("=" * 60)
+
+    _, dict_bytes = measure(build_dict_store)
+    print(f"Before (dict per review):    {dict_bytes:8.1f} bytes/review")
+
+    store, record_bytes = measure(build_review_store)
+    print(f"After (ReviewRecord store):  {record_bytes:8.1f} bytes/review")
+    print(f"ReviewStore cap estimate:    {store.approx_bytes / len(store):8.1f} bytes/review")
+
+    print()
+    print(f"Saved {dict_bytes - record_bytes:.1f} bytes/review ({1 - record_bytes / dict_bytes:.0%})")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,35 @@ TrustProof Backend API Server
 Implements all three tools: Review Processing, Authenticity Validation, and Trust Scoring
 """
 
-from fastapi import FastAPI, HTTPException, Header, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, Header, UploadFile, File, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import Optional, Literal, List, Awaitable, Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import Counter, OrderedDict
+from itertools import islice
 import uvicorn
 from datetime import datetime
+import asyncio
+import gc
+import json
+import os
+import pickle
+import queue
 import random
 import hashlib
+import heapq
+import math
+import sys
+import threading
+import time
+import uuid
+import numpy as np
+
+# Measured from import so /health reports the full cold/warm start cost
+BOOT_STARTED = time.perf_counter()
 
 app = FastAPI(title="TrustProof Backend APIs", version="1.0.0")
 
@@ -31,6 +52,218 @@ def verify_api_key(x_api_key: str):
         raise HTTPException(status_code=403, detail="Invalid API Key")
     return True
 
+# Admin endpoints are disabled unless a separate key is configured
+ADMIN_API_KEY = os.environ.get("TRUSTPROOF_ADMIN_KEY")
+
+def verify_admin_key(x_admin_key: Optional[str]):
+    if not ADMIN_API_KEY or x_admin_key != ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Invalid Admin Key")
+    return True
+
+# ============================================================================
+# REQUEST TRACING
+# ============================================================================
+
+class RequestTrace:
+    def __init__(self, request_id: str, include_timings: bool):
+        self.request_id = request_id
+        self.include_timings = include_timings
+        self.spans = {}
+
+    def record(self, name: str, seconds: float):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+@contextmanager
+def trace_span(name: str):
+    """Time one pipeline stage of the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace = current_trace.get()
+        if trace is not None:
+            trace.record(name, time.perf_counter() - started)
+
+def with_timings(result: dict) -> dict:
+    """Attach per-stage durations (ms) when the caller asked for them"""
+    trace = current_trace.get()
+    if trace is not None and trace.include_timings:
+        result["timings"] = {name: round(seconds * 1000, 3) for name, seconds in trace.spans.items()}
+    return result
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    include_timings = (
+        request.headers.get("x-include-timings", "").lower() == "true"
+        or request.query_params.get("timings", "").lower() == "true"
+    )
+    trace = RequestTrace(request_id, include_timings)
+    token = current_trace.set(trace)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_trace.reset(token)
+    total_ms = (time.perf_counter() - started) * 1000
+    response.headers["X-Request-ID"] = request_id
+    server_timing = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in trace.spans.items()]
+    server_timing.append(f"total;dur={total_ms:.3f}")
+    response.headers["Server-Timing"] = ", ".join(server_timing)
+    return response
+
+# ============================================================================
+# LIVE EVENT FEED
+# ============================================================================
+
+# Each subscriber gets its own bounded queue so a stalled dashboard can only
+# ever hold this many pending events in memory
+SUBSCRIBER_QUEUE_SIZE = 100
+MAX_SUBSCRIBERS = 50
+KEEPALIVE_SECONDS = 15
+
+class EventSubscriber:
+    def __init__(self, business_id: Optional[str], review_status: Optional[str]):
+        self.business_id = business_id
+        self.review_status = review_status
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def matches(self, event: dict) -> bool:
+        if self.business_id and event.get("business_id") != self.business_id:
+            return False
+        if self.review_status and event.get("review_status") != self.review_status:
+            return False
+        return True
+
+    def offer(self, event: dict):
+        """Enqueue without blocking; slow consumers lose their oldest events"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+class EventBroker:
+    """Fan-out of review events to live feed subscribers"""
+
+    def __init__(self):
+        self.subscribers = set()
+
+    def subscribe(self, business_id: Optional[str] = None, review_status: Optional[str] = None) -> EventSubscriber:
+        if len(self.subscribers) >= MAX_SUBSCRIBERS:
+            raise HTTPException(status_code=503, detail="Too many live feed subscribers")
+        subscriber = EventSubscriber(business_id, review_status)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: EventSubscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, event_type: str, payload: dict):
+        event = {"type": event_type, **payload}
+        for subscriber in list(self.subscribers):
+            if subscriber.matches(event):
+                subscriber.offer(event)
+
+event_broker = EventBroker()
+
+# ============================================================================
+# IDEMPOTENCY KEYS
+# ============================================================================
+
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("TRUSTPROOF_IDEMPOTENCY_TTL_SECONDS", 24 * 3600))
+IDEMPOTENCY_MAX_KEYS = int(os.environ.get("TRUSTPROOF_IDEMPOTENCY_MAX_KEYS", 10000))
+
+class IdempotencyEntry:
+    __slots__ = ("fingerprint", "future", "created_at")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        # Resolved with the first response; concurrent retries await the same future
+        self.future = asyncio.get_running_loop().create_future()
+        self.created_at = time.time()
+
+class IdempotencyTable:
+    """First response per Idempotency-Key, bounded in size and evicted by age"""
+
+    def __init__(self, ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS, max_keys: int = IDEMPOTENCY_MAX_KEYS):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self.entries = OrderedDict()
+        self.replayed = 0
+
+    def evict(self, now: float):
+        # Entries are only ever appended, so the oldest are at the front
+        excess = len(self.entries) - self.max_keys
+        stale = []
+        for key, entry in self.entries.items():
+            if excess <= 0 and now - entry.created_at <= self.ttl_seconds:
+                break
+            # Evicting an in-flight key would let a concurrent duplicate run the handler again
+            if entry.future.done():
+                stale.append(key)
+                excess -= 1
+        for key in stale:
+            del self.entries[key]
+
+    async def run(
+        self,
+        scope: str,
+        key: Optional[str],
+        fingerprint: str,
+        response: Response,
+        handler: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        if key is None:
+            return await handler()
+        while True:
+            self.evict(time.time())
+            entry = self.entries.get((scope, key))
+            if entry is None:
+                break
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+            # Either the stored response or, while the first request is in flight, wait for it
+            try:
+                result = await asyncio.shield(entry.future)
+            except asyncio.CancelledError:
+                if not entry.future.cancelled():
+                    raise
+                # The first request was cancelled before responding; claim the key instead
+                continue
+            self.replayed += 1
+            response.headers["Idempotent-Replayed"] = "true"
+            return result
+        # Lookup and insert happen without yielding, so only one request can claim a key
+        entry = IdempotencyEntry(fingerprint)
+        self.entries[(scope, key)] = entry
+        try:
+            result = await handler()
+        except BaseException as e:
+            # Failures and cancellations are not cached; the next retry runs the handler again
+            if self.entries.get((scope, key)) is entry:
+                del self.entries[(scope, key)]
+            if isinstance(e, Exception):
+                entry.future.set_exception(e)
+                entry.future.exception()
+            else:
+                entry.future.cancel()
+            raise
+        entry.future.set_result(result)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self.entries),
+            "max_keys": self.max_keys,
+            "ttl_seconds": self.ttl_seconds,
+            "replayed": self.replayed
+        }
+
+idempotency_table = IdempotencyTable()
+
 # ============================================================================
 # TOOL 1: REVIEW PROCESSING
 # ============================================================================
@@ -49,8 +282,212 @@ class PurchaseVerifyRequest(BaseModel):
     bill_id: str
     business_id: str
 
+# ----------------------------------------------------------------------------
+# Review store
+# ----------------------------------------------------------------------------
+
+REVIEW_TTL_SECONDS = int(os.environ.get("TRUSTPROOF_REVIEW_TTL_SECONDS", 30 * 24 * 3600))
+REVIEW_MEMORY_CAP_MB = int(os.environ.get("TRUSTPROOF_REVIEW_MEMORY_MB", 256))
+
+# Per-entry cost of the OrderedDict slot holding a record
+STORE_ENTRY_OVERHEAD = 100
+# (created_at, review_id) tuple plus its slot in the expiry heap
+HEAP_ENTRY_OVERHEAD = 64
+
+@contextmanager
+def gc_paused():
+    """Bulk loads allocate hundreds of thousands of objects that would trigger repeated full collections"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+class ReviewRecord:
+    """Compact review: no per-record dict, shared business IDs, epoch timestamp"""
+    __slots__ = ("business_id", "bill_id", "review_text", "media_uploaded", "created_at")
+
+    def __init__(self, business_id: str, bill_id: str, review_text: str, media_uploaded: bool, created_at: int):
+        # Thousands of reviews share a handful of businesses
+        self.business_id = sys.intern(business_id)
+        self.bill_id = bill_id
+        self.review_text = review_text
+        self.media_uploaded = media_uploaded
+        self.created_at = created_at
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.created_at).isoformat()
+
+    def as_row(self) -> tuple:
+        return (self.business_id, self.bill_id, self.review_text, self.media_uploaded, self.created_at)
+
+class ReviewStore:
+    """Reviews kept in LRU order, evicted on TTL expiry or when over the memory cap"""
+
+    def __init__(self, ttl_seconds: int = REVIEW_TTL_SECONDS, memory_cap_bytes: int = REVIEW_MEMORY_CAP_MB * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.memory_cap_bytes = memory_cap_bytes
+        self.records = OrderedDict()
+        # (created_at, review_id) min-heap; LRU order says nothing about age once reads reorder it
+        self.expiry_heap = []
+        # While a snapshot reads `records` from a worker thread, changes land here instead;
+        # insertion order is LRU order and None marks a removal
+        self.overlay = None
+        self.count = 0
+        self.approx_bytes = 0
+        self.evicted = 0
+
+    def record_size(self, review_id: str, record: ReviewRecord) -> int:
+        size = (
+            STORE_ENTRY_OVERHEAD
+            + sys.getsizeof(record)
+            + sys.getsizeof(review_id)
+            + sys.getsizeof(record.bill_id)
+            + sys.getsizeof(record.review_text)
+        )
+        if self.ttl_seconds > 0:
+            size += HEAP_ENTRY_OVERHEAD
+        return size
+
+    def expired(self, record: ReviewRecord, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - record.created_at > self.ttl_seconds
+
+    def lookup(self, review_id: str) -> Optional[ReviewRecord]:
+        if self.overlay is not None and review_id in self.overlay:
+            return self.overlay[review_id]
+        return self.records.get(review_id)
+
+    def place(self, review_id: str, record: Optional[ReviewRecord]):
+        """Put a record (or a removal) at the most recently used end"""
+        if self.overlay is not None:
+            self.overlay.pop(review_id, None)
+            self.overlay[review_id] = record
+        elif record is None:
+            del self.records[review_id]
+        else:
+            self.records[review_id] = record
+            self.records.move_to_end(review_id)
+
+    def add(self, review_id: str, record: ReviewRecord):
+        if self.lookup(review_id) is not None:
+            self.remove(review_id)
+        self.place(review_id, record)
+        self.count += 1
+        self.approx_bytes += self.record_size(review_id, record)
+        if self.ttl_seconds > 0:
+            heapq.heappush(self.expiry_heap, (record.created_at, review_id))
+        self.evict(time.time())
+
+    def get(self, review_id: str) -> Optional[ReviewRecord]:
+        record = self.lookup(review_id)
+        if record is None:
+            return None
+        if self.expired(record, time.time()):
+            self.remove(review_id)
+            self.evicted += 1
+            return None
+        self.place(review_id, record)
+        return record
+
+    def remove(self, review_id: str):
+        record = self.lookup(review_id)
+        self.place(review_id, None)
+        self.count -= 1
+        self.approx_bytes -= self.record_size(review_id, record)
+
+    def least_recently_used(self) -> Optional[str]:
+        if self.overlay is None:
+            return next(iter(self.records), None)
+        # Entries touched during the snapshot live in the overlay, so skip them here
+        for review_id in self.records:
+            if review_id not in self.overlay:
+                return review_id
+        for review_id, record in self.overlay.items():
+            if record is not None:
+                return review_id
+        return None
+
+    def evict(self, now: float):
+        self.expire(now)
+        while self.count and self.approx_bytes > self.memory_cap_bytes:
+            self.remove(self.least_recently_used())
+            self.evicted += 1
+
+    def expire(self, now: float):
+        """Drop every record past its TTL, oldest first, regardless of LRU position"""
+        if self.ttl_seconds <= 0:
+            return
+        while self.expiry_heap and now - self.expiry_heap[0][0] > self.ttl_seconds:
+            created_at, review_id = heapq.heappop(self.expiry_heap)
+            record = self.lookup(review_id)
+            # Heap entries for records already removed or replaced are skipped
+            if record is not None and record.created_at == created_at:
+                self.remove(review_id)
+                self.evicted += 1
+        # Stale heap entries left by LRU evictions are pruned once they dominate
+        if self.overlay is None and len(self.expiry_heap) > 2 * self.count + 1024:
+            self.expiry_heap = [(record.created_at, review_id) for review_id, record in self.records.items()]
+            heapq.heapify(self.expiry_heap)
+
+    def __contains__(self, review_id) -> bool:
+        return self.get(review_id) is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def freeze(self) -> OrderedDict:
+        """Hand out `records` for a snapshot; it stays unmodified until thaw()"""
+        self.expire(time.time())
+        self.overlay = {}
+        return self.records
+
+    def thaw(self):
+        overlay, self.overlay = self.overlay, None
+        for review_id, record in overlay.items():
+            if record is None:
+                self.records.pop(review_id, None)
+            else:
+                self.records[review_id] = record
+                self.records.move_to_end(review_id)
+
+    def load_rows(self, rows: list):
+        """Bulk restore into an empty store: column-wise passes, one heapify, one eviction"""
+        if self.records or not rows:
+            for review_id, *fields in rows:
+                self.add(review_id, ReviewRecord(*fields))
+            return
+        ids, business_ids, bill_ids, texts, media_flags, created = zip(*rows)
+        fixed = STORE_ENTRY_OVERHEAD + sys.getsizeof(ReviewRecord("", "", "", False, 0))
+        if self.ttl_seconds > 0:
+            fixed += HEAP_ENTRY_OVERHEAD
+        with gc_paused():
+            self.records.update(zip(ids, map(ReviewRecord, business_ids, bill_ids, texts, media_flags, created)))
+            if self.ttl_seconds > 0:
+                self.expiry_heap = list(zip(created, ids))
+                heapq.heapify(self.expiry_heap)
+        self.count = len(self.records)
+        self.approx_bytes = (
+            fixed * self.count
+            + sum(map(sys.getsizeof, ids))
+            + sum(map(sys.getsizeof, bill_ids))
+            + sum(map(sys.getsizeof, texts))
+        )
+        self.evict(time.time())
+
+    def stats(self) -> dict:
+        return {
+            "reviews": self.count,
+            "approx_bytes": self.approx_bytes,
+            "memory_cap_bytes": self.memory_cap_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "evicted": self.evicted
+        }
+
 # In-memory storage (use database in production)
-reviews_db = {}
+reviews_db = ReviewStore()
 verified_bills = {
     "BILL-2024-001234": {"business_id": "BIZ-HOTEL-5678", "amount": 2500.0, "date": "2024-01-14"},
     "BILL-2024-001235": {"business_id": "BIZ-REST-9012", "amount": 1200.0, "date": "2024-01-13"},
@@ -58,26 +495,51 @@ verified_bills = {
 }
 
 @app.post("/tools/review/intake")
-async def submit_review(request: ReviewIntakeRequest, x_api_key: str = Header(...)):
+async def submit_review(
+    request: ReviewIntakeRequest,
+    response: Response,
+    x_api_key: str = Header(...),
+    idempotency_key: Optional[str] = Header(None)
+):
     """Submit a customer review"""
     verify_api_key(x_api_key)
+    return await idempotency_table.run(
+        "review_intake",
+        idempotency_key,
+        request.model_dump_json(),
+        response,
+        lambda: process_review_intake(request)
+    )
+
+async def process_review_intake(request: ReviewIntakeRequest) -> dict:
     try:
-        review_id = hashlib.md5(f"{request.bill_id}{datetime.now()}".encode()).hexdigest()[:12]
+        with trace_span("review_store"):
+            review_id = hashlib.md5(f"{request.bill_id}{datetime.now()}".encode()).hexdigest()[:12]
+            
+            record = ReviewRecord(
+                business_id=request.business_id,
+                bill_id=request.bill_id,
+                review_text=request.review_text,
+                media_uploaded=request.media_uploaded,
+                created_at=int(time.time())
+            )
+            reviews_db.add(review_id, record)
         
-        reviews_db[review_id] = {
-            "business_id": request.business_id,
-            "bill_id": request.bill_id,
-            "review_text": request.review_text,
-            "media_uploaded": request.media_uploaded,
-            "timestamp": datetime.now().isoformat()
-        }
+        with trace_span("event_publish"):
+            event_broker.publish("review_intake", {
+                "review_id": review_id,
+                "business_id": request.business_id,
+                "review_status": "SUBMITTED",
+                "media_uploaded": request.media_uploaded,
+                "timestamp": record.timestamp
+            })
         
-        return {
+        return with_timings({
             "status": "success",
             "review_id": review_id,
             "message": "Review submitted successfully",
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -86,21 +548,22 @@ async def check_consistency(request: ConsistencyCheckRequest, x_api_key: str = H
     """Validate experience consistency"""
     verify_api_key(x_api_key)
     try:
-        # Determine consistency level
-        if request.consistency_score >= 0.8:
-            verdict = "Highly Consistent"
-        elif request.consistency_score >= 0.5:
-            verdict = "Moderately Consistent"
-        else:
-            verdict = "Suspicious Pattern Detected"
+        with trace_span("consistency_check"):
+            # Determine consistency level
+            if request.consistency_score >= 0.8:
+                verdict = "Highly Consistent"
+            elif request.consistency_score >= 0.5:
+                verdict = "Moderately Consistent"
+            else:
+                verdict = "Suspicious Pattern Detected"
         
-        return {
+        return with_timings({
             "status": "success",
             "consistency_score": request.consistency_score,
             "verdict": verdict,
             "notes": request.notes or "Automated consistency validation completed",
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -110,33 +573,34 @@ async def verify_purchase(request: PurchaseVerifyRequest, x_api_key: str = Heade
     verify_api_key(x_api_key)
     try:
         # Check if bill exists and matches business
-        bill_data = verified_bills.get(request.bill_id)
+        with trace_span("purchase_lookup"):
+            bill_data = verified_bills.get(request.bill_id)
         
         if not bill_data:
-            return {
+            return with_timings({
                 "verified": False,
                 "confidence": 0.0,
                 "message": "Bill ID not found in records",
                 "transaction_date": None,
                 "amount": None
-            }
+            })
         
         if bill_data["business_id"] != request.business_id:
-            return {
+            return with_timings({
                 "verified": False,
                 "confidence": 0.0,
                 "message": "Bill ID does not match business records",
                 "transaction_date": None,
                 "amount": None
-            }
+            })
         
-        return {
+        return with_timings({
             "verified": True,
             "confidence": 0.95,
             "message": "Purchase verified successfully",
             "transaction_date": bill_data["date"],
             "amount": bill_data["amount"]
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -147,6 +611,9 @@ async def verify_purchase(request: PurchaseVerifyRequest, x_api_key: str = Heade
 class TextAuthRequest(BaseModel):
     review_text: str
 
+class TextBatchAuthRequest(BaseModel):
+    review_texts: List[str] = Field(..., min_length=1, max_length=500)
+
 class MediaAuthRequest(BaseModel):
     media_id: str
     media_url: str
@@ -158,72 +625,246 @@ AI_PATTERNS = [
     "wonderful atmosphere", "impeccable service", "truly memorable"
 ]
 
+# ----------------------------------------------------------------------------
+# Stylometric features
+# ----------------------------------------------------------------------------
+
+STYLOMETRIC_FEATURES = (
+    "type_token_ratio",
+    "hapax_ratio",
+    "sentence_length_mean",
+    "sentence_burstiness",
+    "punctuation_ratio",
+    "expressive_punctuation",
+    "repeated_bigram_ratio",
+    "char_trigram_entropy",
+)
+
+# Heuristic logistic weights: uniform sentence lengths, long polished sentences
+# and templated repetition push towards AI; bursty, expressive text towards human
+STYLOMETRIC_WEIGHTS = np.array([0.8, -0.6, 0.08, -2.5, 2.0, -1.5, 3.0, -1.0])
+STYLOMETRIC_BIAS = 0.1
+
+# Below this the text is clearly human and the expensive model can be skipped
+DEEP_CHECK_THRESHOLD = 0.35
+
+SENTENCE_ENDINGS = ".!?"
+EXPRESSIVE_PUNCTUATION = "!?"
+
+def extract_text_features(text: str) -> dict:
+    """Compute every stylometric feature in one scan over the characters"""
+    word_counts = Counter()
+    bigram_counts = Counter()
+    trigram_counts = Counter()
+    sentence_lengths = []
+    punctuation = 0
+    expressive = 0
+    word_chars = []
+    previous_word = None
+    sentence_words = 0
+    lowered = text.lower()
+
+    for i, ch in enumerate(lowered):
+        if i + 3 <= len(lowered):
+            trigram_counts[lowered[i:i + 3]] += 1
+        if ch.isalnum() or ch == "'":
+            word_chars.append(ch)
+            continue
+        if word_chars:
+            word = "".join(word_chars)
+            word_chars = []
+            word_counts[word] += 1
+            if previous_word is not None:
+                bigram_counts[(previous_word, word)] += 1
+            previous_word = word
+            sentence_words += 1
+        if ch.isspace():
+            continue
+        punctuation += 1
+        if ch in EXPRESSIVE_PUNCTUATION:
+            expressive += 1
+        if ch in SENTENCE_ENDINGS and sentence_words:
+            sentence_lengths.append(sentence_words)
+            sentence_words = 0
+    if word_chars:
+        word = "".join(word_chars)
+        word_counts[word] += 1
+        if previous_word is not None:
+            bigram_counts[(previous_word, word)] += 1
+        sentence_words += 1
+    if sentence_words:
+        sentence_lengths.append(sentence_words)
+
+    total_words = sum(word_counts.values())
+    total_bigrams = sum(bigram_counts.values())
+    total_trigrams = sum(trigram_counts.values())
+    sentence_count = len(sentence_lengths)
+
+    mean_length = total_words / sentence_count if sentence_count else 0.0
+    if sentence_count > 1:
+        variance = sum((n - mean_length) ** 2 for n in sentence_lengths) / sentence_count
+        # Coefficient of variation; human writing mixes short and long sentences
+        burstiness = min(math.sqrt(variance) / mean_length, 2.0)
+    else:
+        burstiness = 0.5
+
+    entropy = 0.0
+    if total_trigrams > 1:
+        for count in trigram_counts.values():
+            p = count / total_trigrams
+            entropy -= p * math.log2(p)
+        entropy /= math.log2(total_trigrams)
+
+    return {
+        "type_token_ratio": len(word_counts) / total_words if total_words else 0.0,
+        "hapax_ratio": sum(1 for c in word_counts.values() if c == 1) / total_words if total_words else 0.0,
+        "sentence_length_mean": min(mean_length, 40.0),
+        "sentence_burstiness": burstiness,
+        "punctuation_ratio": punctuation / len(text) if text else 0.0,
+        "expressive_punctuation": expressive / sentence_count if sentence_count else 0.0,
+        "repeated_bigram_ratio": sum(c - 1 for c in bigram_counts.values()) / total_bigrams if total_bigrams else 0.0,
+        "char_trigram_entropy": entropy,
+    }
+
+def stylometric_probabilities(feature_rows: List[dict]) -> np.ndarray:
+    """Score many reviews at once with a single matrix-vector product"""
+    matrix = np.array(
+        [[row[name] for name in STYLOMETRIC_FEATURES] for row in feature_rows],
+        dtype=np.float64
+    ).reshape(-1, len(STYLOMETRIC_FEATURES))
+    logits = matrix @ STYLOMETRIC_WEIGHTS + STYLOMETRIC_BIAS
+    return 1.0 / (1.0 + np.exp(-logits))
+
+def score_review_text(review_text: str, features: dict, stylometric_probability: float) -> dict:
+    text_lower = review_text.lower()
+    
+    # Detect AI patterns
+    ai_pattern_count = sum(1 for pattern in AI_PATTERNS if pattern in text_lower)
+    
+    # The stylometric estimate can only raise the stock-phrase probability, never dilute it
+    phrase_probability = min(ai_pattern_count * 0.2, 0.95)
+    blended_probability = 0.6 * phrase_probability + 0.4 * stylometric_probability
+    ai_probability = min(max(phrase_probability, blended_probability), 0.95)
+    
+    # Word count check
+    word_count = len(review_text.split())
+    if word_count < 10:
+        ai_probability += 0.1
+    
+    # Determine validity
+    text_valid = ai_probability < 0.6
+    text_score = 1.0 - ai_probability if text_valid else 0.4
+    
+    flags = []
+    if ai_probability > 0.5:
+        flags.append("High AI probability detected")
+    if word_count < 10:
+        flags.append("Suspiciously short review")
+    if not flags:
+        flags.append("No suspicious patterns detected")
+    
+    return {
+        "ai_probability": round(ai_probability, 2),
+        "text_valid": text_valid,
+        "reason": ", ".join(flags),
+        "text_score": round(text_score, 2),
+        "word_count": word_count,
+        "stylometric_probability": round(stylometric_probability, 2),
+        # Short texts give the features too little to go on to call them clearly human
+        "deep_check_recommended": (
+            ai_pattern_count > 0
+            or word_count < 10
+            or stylometric_probability >= DEEP_CHECK_THRESHOLD
+        ),
+        "features": {name: round(value, 4) for name, value in features.items()}
+    }
+
 @app.post("/tools/auth/text")
 async def validate_text(request: TextAuthRequest, x_api_key: str = Header(...)):
     """Validate review text authenticity"""
     verify_api_key(x_api_key)
     try:
-        text_lower = request.review_text.lower()
+        with trace_span("text_scoring"):
+            features = extract_text_features(request.review_text)
+            stylometric_probability = float(stylometric_probabilities([features])[0])
+            result = score_review_text(request.review_text, features, stylometric_probability)
         
-        # Detect AI patterns
-        ai_pattern_count = sum(1 for pattern in AI_PATTERNS if pattern in text_lower)
-        
-        # Calculate AI probability
-        ai_probability = min(ai_pattern_count * 0.2, 0.95)
-        
-        # Word count check
-        word_count = len(request.review_text.split())
-        if word_count < 10:
-            ai_probability += 0.1
-        
-        # Determine validity
-        text_valid = ai_probability < 0.6
-        text_score = 1.0 - ai_probability if text_valid else 0.4
-        
-        flags = []
-        if ai_probability > 0.5:
-            flags.append("High AI probability detected")
-        if word_count < 10:
-            flags.append("Suspiciously short review")
-        if not flags:
-            flags.append("No suspicious patterns detected")
+        return with_timings(result)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/tools/auth/text/batch")
+async def validate_text_batch(request: TextBatchAuthRequest, x_api_key: str = Header(...)):
+    """Validate many review texts in one call"""
+    verify_api_key(x_api_key)
+    try:
+        with trace_span("text_scoring"):
+            feature_rows = [extract_text_features(text) for text in request.review_texts]
+            probabilities = stylometric_probabilities(feature_rows)
+            results = [
+                score_review_text(text, features, float(probability))
+                for text, features, probability in zip(request.review_texts, feature_rows, probabilities)
+            ]
         
-        return {
-            "ai_probability": round(ai_probability, 2),
-            "text_valid": text_valid,
-            "reason": ", ".join(flags),
-            "text_score": round(text_score, 2),
-            "word_count": word_count
-        }
+        return with_timings({
+            "results": results,
+            "count": len(results),
+            "deep_check_count": sum(1 for r in results if r["deep_check_recommended"])
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Simulated media database
 media_db = {}
 
+UPLOAD_HASH_CHUNK = 1024 * 1024
+
 @app.post("/tools/media/upload")
-async def upload_media(file: UploadFile = File(...), x_api_key: str = Header(...)):
+async def upload_media(
+    response: Response,
+    file: UploadFile = File(...),
+    x_api_key: str = Header(...),
+    idempotency_key: Optional[str] = Header(None)
+):
     """Upload media file"""
     verify_api_key(x_api_key)
+    fingerprint = ""
+    if idempotency_key is not None:
+        # The key must match the bytes uploaded, not just the file name
+        digest = hashlib.sha256()
+        while chunk := await file.read(UPLOAD_HASH_CHUNK):
+            digest.update(chunk)
+        await file.seek(0)
+        fingerprint = f"{file.filename}:{file.content_type}:{digest.hexdigest()}"
+    return await idempotency_table.run(
+        "media_upload",
+        idempotency_key,
+        fingerprint,
+        response,
+        lambda: process_media_upload(file)
+    )
+
+async def process_media_upload(file: UploadFile) -> dict:
     try:
-        # Generate media ID
-        media_id = hashlib.md5(f"{file.filename}{datetime.now()}".encode()).hexdigest()[:16]
-        
-        # Simulate file storage
-        media_url = f"http://127.0.0.1:8000/media/{media_id}"
-        
-        media_db[media_id] = {
-            "filename": file.filename,
-            "media_url": media_url,
-            "upload_time": datetime.now().isoformat()
-        }
+        with trace_span("media_store"):
+            # Generate media ID
+            media_id = hashlib.md5(f"{file.filename}{datetime.now()}".encode()).hexdigest()[:16]
+            
+            # Simulate file storage
+            media_url = f"http://127.0.0.1:8000/media/{media_id}"
+            
+            media_db[media_id] = {
+                "filename": file.filename,
+                "media_url": media_url,
+                "upload_time": datetime.now().isoformat()
+            }
         
-        return {
+        return with_timings({
             "status": "success",
             "media_id": media_id,
             "media_url": media_url,
             "message": "Media uploaded successfully"
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -232,29 +873,244 @@ async def validate_media(request: MediaAuthRequest, x_api_key: str = Header(...)
     """Validate media authenticity"""
     verify_api_key(x_api_key)
     try:
-        # Simulate deepfake/manipulation detection
-        # In production, this would call actual AI models
-        
-        # Random authenticity check (replace with real AI model)
-        authenticity_score = random.uniform(0.6, 0.98)
-        
-        # Check if media exists in our database
-        media_exists = request.media_id in media_db
-        
-        if not media_exists:
-            authenticity_score *= 0.7  # Penalize unknown sources
+        with trace_span("media_analysis"):
+            # Simulate deepfake/manipulation detection
+            # In production, this would call actual AI models
+            
+            # Random authenticity check (replace with real AI model)
+            authenticity_score = random.uniform(0.6, 0.98)
+            
+            # Check if media exists in our database
+            media_exists = request.media_id in media_db
+            
+            if not media_exists:
+                authenticity_score *= 0.7  # Penalize unknown sources
         
         media_authentic = authenticity_score > 0.7
         
-        return {
+        return with_timings({
             "media_authentic": media_authentic,
             "media_score": round(authenticity_score, 2),
             "deepfake_probability": round(1 - authenticity_score, 2),
             "analysis": "Original media detected" if media_authentic else "Potential manipulation detected"
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ============================================================================
+# AUDIT LOG
+# ============================================================================
+
+AUDIT_LOG_PATH = os.environ.get("TRUSTPROOF_AUDIT_LOG_PATH", "trustproof_audit.log")
+AUDIT_MAX_LATENCY_MS = int(os.environ.get("TRUSTPROOF_AUDIT_MAX_LATENCY_MS", 50))
+AUDIT_MAX_PENDING = int(os.environ.get("TRUSTPROOF_AUDIT_MAX_PENDING", 10000))
+AUDIT_MAX_BATCH = 1024
+AUDIT_SHUTDOWN_RETRIES = 3
+AUDIT_GENESIS_HASH = "0" * 64
+
+def audit_entry_hash(entry: dict) -> str:
+    """SHA-256 over the canonical JSON of an entry, excluding its own hash"""
+    body = {key: value for key, value in entry.items() if key != "hash"}
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class AuditUnavailable(Exception):
+    pass
+
+class AuditBacklogged(AuditUnavailable):
+    pass
+
+class AuditLog:
+    """Append-only, hash-chained log written by a background group-commit thread"""
+
+    def __init__(
+        self,
+        path: str = AUDIT_LOG_PATH,
+        max_latency_ms: int = AUDIT_MAX_LATENCY_MS,
+        max_pending: int = AUDIT_MAX_PENDING
+    ):
+        self.path = path
+        self.max_latency = max_latency_ms / 1000
+        # Bounded so a slow disk or dead writer turns into backpressure, not unbounded memory
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.thread = None
+        self.last_seq = 0
+        self.last_hash = AUDIT_GENESIS_HASH
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failed_commits = 0
+        self.retrying = 0
+        self.last_fsync_ms = None
+        self.last_error = None
+
+    def resume(self):
+        """Continue the chain from the last complete entry, dropping a torn final write"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            tail_start = max(0, size - 65536)
+            f.seek(tail_start)
+            tail = f.read()
+            lines = tail.split(b"\n")
+            # The final element is empty when the file ends with a newline
+            good_end = size if tail.endswith(b"\n") else size - len(lines[-1])
+            if good_end != size:
+                f.truncate(good_end)
+            # A tail window that starts mid-file begins with a partial line
+            candidates = lines[1:-1] if tail_start else lines[:-1]
+            complete = [line for line in candidates if line.strip()]
+            if complete:
+                last = json.loads(complete[-1])
+                self.last_seq = last["seq"]
+                self.last_hash = last["hash"]
+
+    def start(self):
+        try:
+            self.resume()
+        except Exception as e:
+            # Boot anyway, but with the writer stopped: /health reports degraded and scoring returns 503
+            self.last_error = (
+                f"cannot resume audit chain from {self.path}: {e}; "
+                f"run verify_audit_log.py {self.path} to locate the damaged entry"
+            )
+            return
+        self.thread = threading.Thread(target=self.writer_loop, name="audit-writer", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread:
+            self.pending.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def record(self, entry: dict):
+        # Never blocks the event loop; chaining and I/O happen on the writer thread
+        if self.thread is None or not self.thread.is_alive():
+            raise AuditUnavailable(f"Audit log writer is not running: {self.last_error}")
+        try:
+            self.pending.put_nowait(entry)
+        except queue.Full:
+            raise AuditBacklogged("Audit log writer is backlogged")
+
+    def writer_loop(self):
+        with open(self.path, "ab") as f:
+            batch = []
+            failures = 0
+            stopping = False
+            while True:
+                if not batch:
+                    if stopping:
+                        break
+                    first = self.pending.get()
+                    if first is None:
+                        break
+                    batch.append(first)
+                # Gather whatever else arrives within the latency bound into one fsync
+                deadline = time.monotonic() + self.max_latency
+                while not stopping and len(batch) < AUDIT_MAX_BATCH:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        entry = self.pending.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if entry is None:
+                        stopping = True
+                        break
+                    batch.append(entry)
+                try:
+                    self.commit(f, batch)
+                    batch = []
+                    failures = 0
+                    self.retrying = 0
+                except Exception as e:
+                    # Keep the batch: these decisions were already returned to clients
+                    failures += 1
+                    self.failed_commits += 1
+                    self.retrying = len(batch)
+                    self.last_error = str(e)
+                    if stopping and failures >= AUDIT_SHUTDOWN_RETRIES:
+                        self.dropped += len(batch)
+                        break
+                    time.sleep(min(0.1 * 2 ** failures, 5.0))
+
+    def commit(self, f, batch: list):
+        """Write and fsync a batch; chain state only advances once it is durable"""
+        seq = self.last_seq
+        prev_hash = self.last_hash
+        lines = []
+        dropped = 0
+        for entry in batch:
+            try:
+                chained = {"seq": seq + 1, "prev_hash": prev_hash, **entry}
+                chained["hash"] = audit_entry_hash(chained)
+                lines.append(json.dumps(chained, sort_keys=True, separators=(",", ":")))
+            except (TypeError, ValueError) as e:
+                # An unserializable entry would fail every retry; skip it without using a seq
+                dropped += 1
+                self.dropped += 1
+                self.last_error = f"entry dropped: {e}"
+                continue
+            seq = chained["seq"]
+            prev_hash = chained["hash"]
+        if not lines:
+            return
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        started = time.perf_counter()
+        offset = f.seek(0, os.SEEK_END)
+        try:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        except Exception:
+            # Cut off any partial write so the retry appends to a clean chain
+            try:
+                f.truncate(offset)
+            except Exception:
+                pass
+            raise
+        self.last_seq = seq
+        self.last_hash = prev_hash
+        self.last_fsync_ms = round((time.perf_counter() - started) * 1000, 3)
+        self.written += len(lines)
+        self.batches += 1
+        # A dropped entry stays reported until a later batch commits cleanly
+        if not dropped:
+            self.last_error = None
+
+    def healthy(self) -> bool:
+        writer_alive = self.thread is not None and self.thread.is_alive()
+        return writer_alive and not self.retrying and not self.pending.full()
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "healthy": self.healthy(),
+            "written": self.written,
+            "pending": self.pending.qsize(),
+            "max_pending": self.pending.maxsize,
+            "retrying": self.retrying,
+            "batches": self.batches,
+            "failed_commits": self.failed_commits,
+            "dropped": self.dropped,
+            "last_fsync_ms": self.last_fsync_ms,
+            "last_error": self.last_error
+        }
+
+audit_log = AuditLog()
+
+@app.on_event("startup")
+async def start_audit_log():
+    audit_log.start()
+
+@app.on_event("shutdown")
+async def stop_audit_log():
+    # Flushes everything still queued before the process exits
+    await asyncio.to_thread(audit_log.stop)
+
 # ============================================================================
 # TOOL 3: TRUST SCORING
 # ============================================================================
@@ -264,6 +1120,8 @@ class TrustScoreRequest(BaseModel):
     media_score: Optional[float] = Field(None, ge=0, le=1)
     purchase_verified: bool
     consistency_score: float = Field(..., ge=0, le=1)
+    review_id: Optional[str] = None
+    business_id: Optional[str] = None
 
 @app.post("/tools/trust/score")
 async def generate_trust_score(request: TrustScoreRequest, x_api_key: str = Header(...)):
@@ -278,30 +1136,31 @@ async def generate_trust_score(request: TrustScoreRequest, x_api_key: str = Head
             "media": 0.20          # 20%
         }
         
-        # Calculate weighted score
-        purchase_score = 1.0 if request.purchase_verified else 0.0
-        media_score = request.media_score if request.media_score is not None else 0.5
-        
-        final_score = (
-            weights["purchase"] * purchase_score +
-            weights["text"] * request.text_score +
-            weights["consistency"] * request.consistency_score +
-            weights["media"] * media_score
-        )
-        
-        # Convert to 0-100 scale
-        final_trust_score = int(final_score * 100)
-        
-        # Determine trust level
-        if final_trust_score >= 75:
-            trust_level = "High"
-            review_status = "TRUSTED"
-        elif final_trust_score >= 50:
-            trust_level = "Medium"
-            review_status = "REVIEW MANUALLY"
-        else:
-            trust_level = "Low"
-            review_status = "FLAGGED"
+        with trace_span("scoring"):
+            # Calculate weighted score
+            purchase_score = 1.0 if request.purchase_verified else 0.0
+            media_score = request.media_score if request.media_score is not None else 0.5
+            
+            final_score = (
+                weights["purchase"] * purchase_score +
+                weights["text"] * request.text_score +
+                weights["consistency"] * request.consistency_score +
+                weights["media"] * media_score
+            )
+            
+            # Convert to 0-100 scale
+            final_trust_score = int(final_score * 100)
+            
+            # Determine trust level
+            if final_trust_score >= 75:
+                trust_level = "High"
+                review_status = "TRUSTED"
+            elif final_trust_score >= 50:
+                trust_level = "Medium"
+                review_status = "REVIEW MANUALLY"
+            else:
+                trust_level = "Low"
+                review_status = "FLAGGED"
         
         # Generate breakdown
         breakdown = {
@@ -311,16 +1170,285 @@ async def generate_trust_score(request: TrustScoreRequest, x_api_key: str = Head
             "media_authenticity": f"{media_score * 100:.0f}%" if request.media_score else "N/A"
         }
         
-        return {
+        result = {
             "final_trust_score": final_trust_score,
             "trust_level": trust_level,
             "review_status": review_status,
             "breakdown": breakdown,
             "timestamp": datetime.now().isoformat()
         }
+        
+        # Attribute the decision to a business so dashboards can filter on it
+        business_id = request.business_id
+        if business_id is None and request.review_id:
+            record = reviews_db.get(request.review_id)
+            business_id = record.business_id if record else None
+        
+        with trace_span("audit_record"):
+            trace = current_trace.get()
+            audit_log.record({
+                "timestamp": result["timestamp"],
+                "request_id": trace.request_id if trace else None,
+                "review_id": request.review_id,
+                "business_id": business_id,
+                "inputs": request.model_dump(exclude={"review_id", "business_id"}),
+                "weights": weights,
+                "outputs": {
+                    "final_trust_score": final_trust_score,
+                    "trust_level": trust_level,
+                    "review_status": review_status,
+                    "breakdown": breakdown
+                }
+            })
+        
+        with trace_span("event_publish"):
+            event_broker.publish("trust_score", {
+                "review_id": request.review_id,
+                "business_id": business_id,
+                **result
+            })
+        
+        return with_timings(result)
+    except AuditUnavailable as e:
+        # Refuse the decision rather than return one that cannot be audited
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ============================================================================
+# LIVE FEED STREAM
+# ============================================================================
+
+def format_sse(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+@app.get("/tools/events/stream")
+async def stream_events(
+    request: Request,
+    business_id: Optional[str] = None,
+    review_status: Optional[str] = None,
+    api_key: Optional[str] = None,
+    x_api_key: Optional[str] = Header(None)
+):
+    """Server-Sent Events feed of review intake and trust score events"""
+    # Browsers' EventSource cannot set headers, so the key may also come as a query param
+    verify_api_key(x_api_key or api_key)
+    subscriber = event_broker.subscribe(business_id, review_status)
+
+    async def event_generator():
+        try:
+            yield format_sse("subscribed", {"business_id": business_id, "review_status": review_status})
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                # Tell the consumer it fell behind instead of silently skipping events
+                if subscriber.dropped:
+                    yield format_sse("dropped", {"count": subscriber.dropped})
+                    subscriber.dropped = 0
+                yield format_sse(event["type"], event)
+        finally:
+            event_broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ============================================================================
+# ADMIN: SAMPLING PROFILER
+# ============================================================================
+
+PROFILE_MAX_SECONDS = 60
+PROFILE_SAMPLE_INTERVAL = 0.005
+profile_lock = threading.Lock()
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def sample_stacks(seconds: float, interval: float) -> Counter:
+    """Periodically snapshot every thread's stack, folded root-first"""
+    stacks = Counter()
+    own_thread = threading.get_ident()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            stacks[";".join(reversed(labels))] += 1
+        time.sleep(interval)
+    return stacks
+
+@app.get("/admin/profile")
+async def run_profiler(
+    seconds: float = 5.0,
+    interval_ms: float = PROFILE_SAMPLE_INTERVAL * 1000,
+    x_admin_key: Optional[str] = Header(None)
+):
+    """Sample all threads for N seconds; returns collapsed stacks for flamegraph tools"""
+    verify_admin_key(x_admin_key)
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {PROFILE_MAX_SECONDS}]")
+    if interval_ms < 1:
+        raise HTTPException(status_code=400, detail="interval_ms must be at least 1")
+    if not profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profiling session is already running")
+    try:
+        # Sample from a worker thread so the event loop keeps serving the traffic being profiled
+        stacks = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+    finally:
+        profile_lock.release()
+    body = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+    return PlainTextResponse(
+        body,
+        headers={"Content-Disposition": "attachment; filename=trustproof-profile.collapsed"}
+    )
+
+# ============================================================================
+# STATE SNAPSHOTS (WARM RESTART)
+# ============================================================================
+
+SNAPSHOT_PATH = os.environ.get("TRUSTPROOF_SNAPSHOT_PATH", "trustproof_snapshot.bin")
+SNAPSHOT_INTERVAL_SECONDS = int(os.environ.get("TRUSTPROOF_SNAPSHOT_INTERVAL", 30))
+SNAPSHOT_VERSION = 3
+# Rows per pickle frame; small frames let the event loop take the GIL between them
+SNAPSHOT_CHUNK_ROWS = 10000
+
+startup_stats = {
+    "startup_seconds": None,
+    "snapshot_loaded": False,
+    "snapshot_load_seconds": None,
+    "restored_reviews": 0,
+    "restored_media": 0,
+    "last_snapshot_at": None,
+    "last_snapshot_seconds": None,
+    "last_snapshot_error": None,
+    "snapshot_writes_paused": False
+}
+
+def review_rows_from_v1(reviews: dict) -> list:
+    """Version 1 snapshots held one dict per review with an ISO timestamp"""
+    return [
+        (
+            review_id,
+            review["business_id"],
+            review["bill_id"],
+            review["review_text"],
+            review["media_uploaded"],
+            int(datetime.fromisoformat(review["timestamp"]).timestamp())
+        )
+        for review_id, review in reviews.items()
+    ]
+
+def capture_state() -> dict:
+    """Point-in-time view of the stores; only cheap reference work happens on the event loop"""
+    return {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": datetime.now().isoformat(),
+        # Frozen until thaw(), so the worker thread can walk it while handlers keep writing
+        "reviews": reviews_db.freeze(),
+        "media": dict(media_db)
+    }
+
+def write_snapshot(state: dict, path: str = SNAPSHOT_PATH):
+    """Serialize to a temp file and atomically swap it in"""
+    records = state["reviews"]
+    header = {**state, "reviews": None, "review_count": len(records)}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Plain tuples pickle far smaller than the record objects
+        items = iter(records.items())
+        while chunk := [(review_id, *record.as_row()) for review_id, record in islice(items, SNAPSHOT_CHUNK_ROWS)]:
+            pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> bool:
+    """Bulk-load a snapshot into the in-memory stores; returns False if none usable"""
+    if not os.path.exists(path):
+        return False
+    with open(path, "rb") as f, gc_paused():
+        state = pickle.load(f)
+        version = state.get("version")
+        rows = []
+        if version == SNAPSHOT_VERSION:
+            while len(rows) < state["review_count"]:
+                rows.extend(pickle.load(f))
+    if version == 1:
+        rows = review_rows_from_v1(state["reviews"])
+    elif version == 2:
+        rows = state["reviews"]
+    elif version != SNAPSHOT_VERSION:
+        # Keep the unreadable file intact rather than overwrite it with an empty store
+        startup_stats["last_snapshot_error"] = f"unsupported snapshot version {version}; snapshot writes paused"
+        startup_stats["snapshot_writes_paused"] = True
+        return False
+    reviews_db.load_rows(rows)
+    media_db.update(state["media"])
+    startup_stats["restored_reviews"] = len(reviews_db)
+    startup_stats["restored_media"] = len(state["media"])
+    return True
+
+async def save_snapshot():
+    if startup_stats["snapshot_writes_paused"]:
+        return
+    global snapshot_future
+    # One snapshot at a time; a shutdown save waits for a periodic one still writing
+    while snapshot_future is not None and not snapshot_future.done():
+        await asyncio.wait({snapshot_future})
+    started = time.perf_counter()
+    try:
+        # Building rows, pickling and disk I/O all happen off the event loop
+        snapshot_future = asyncio.ensure_future(asyncio.to_thread(write_snapshot, capture_state()))
+        # Thaw only once the worker is done with the frozen records, even if we are cancelled
+        snapshot_future.add_done_callback(lambda _: reviews_db.thaw())
+        await asyncio.shield(snapshot_future)
+        startup_stats["last_snapshot_at"] = datetime.now().isoformat()
+        startup_stats["last_snapshot_seconds"] = round(time.perf_counter() - started, 4)
+        startup_stats["last_snapshot_error"] = None
+    except Exception as e:
+        startup_stats["last_snapshot_error"] = str(e)
+
+async def snapshot_loop():
+    while True:
+        await asyncio.sleep(SNAPSHOT_INTERVAL_SECONDS)
+        await save_snapshot()
+
+snapshot_task = None
+snapshot_future = None
+
+@app.on_event("startup")
+async def restore_state():
+    global snapshot_task
+    started = time.perf_counter()
+    try:
+        startup_stats["snapshot_loaded"] = load_snapshot()
+    except Exception as e:
+        # A corrupt snapshot must never keep the service from booting
+        startup_stats["last_snapshot_error"] = f"load failed: {e}"
+    # Restored records live until evicted; keep them out of every future full collection
+    gc.freeze()
+    startup_stats["snapshot_load_seconds"] = round(time.perf_counter() - started, 4)
+    startup_stats["startup_seconds"] = round(time.perf_counter() - BOOT_STARTED, 4)
+    if SNAPSHOT_INTERVAL_SECONDS > 0:
+        snapshot_task = asyncio.create_task(snapshot_loop())
+
+@app.on_event("shutdown")
+async def persist_state():
+    if snapshot_task:
+        snapshot_task.cancel()
+    await save_snapshot()
+
 # ============================================================================
 # HEALTH CHECK
 # ============================================================================
@@ -334,17 +1462,26 @@ async def root():
         "endpoints": {
             "review_processing": "/tools/review/*",
             "authenticity": "/tools/auth/*",
-            "trust_scoring": "/tools/trust/score"
+            "trust_scoring": "/tools/trust/score",
+            "live_feed": "/tools/events/stream"
         }
     }
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    # Unaudited trust decisions are a failure, not just a statistic
+    healthy = audit_log.healthy()
+    body = {
+        "status": "healthy" if healthy else "degraded",
+        "timestamp": datetime.now().isoformat(),
+        "startup": startup_stats,
+        "review_store": reviews_db.stats(),
+        "idempotency": idempotency_table.stats(),
+        "audit_log": audit_log.stats()
+    }
+    return JSONResponse(body, status_code=200 if healthy else 503)
 
 if __name__ == "__main__":
-    import os
-    
     # Use Render's PORT environment variable, fallback to 8000 for local development
     port = int(os.environ.get("PORT", 8000))
     host = "0.0.0.0"  # Listen on all interfaces for cloud deployment
@@ -357,9 +1494,11 @@ if __name__ == "__main__":
     print("  - POST /tools/review/consistency-check")
     print("  - POST /tools/verify/purchase")
     print("  - POST /tools/auth/text")
+    print("  - POST /tools/auth/text/batch")
     print("  - POST /tools/auth/media")
     print("  - POST /tools/media/upload")
     print("  - POST /tools/trust/score")
+    print("  - GET  /tools/events/stream")
     print("\n✅ Server ready for agent requests!\n")
     
     uvicorn.run(app, host=host, port=port)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Audit Log Verifier for TrustProof Backend
+Streams the hash-chained audit log and checks that no entry was altered, removed or reordered
+
+Usage: python verify_audit_log.py [path/to/trustproof_audit.log]
+"""
+
+import json
+import sys
+
+from trustproof_backend import AUDIT_GENESIS_HASH, AUDIT_LOG_PATH, audit_entry_hash
+
+def verify_audit_log(path):
+    """Returns (entries_checked, error); error is None when the whole chain is intact"""
+    expected_seq = 1
+    expected_prev = AUDIT_GENESIS_HASH
+    checked = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                return checked, f"line {line_number}: not valid JSON"
+            if entry.get("seq") != expected_seq:
+                return checked, f"line {line_number}: expected seq {expected_seq}, found {entry.get('seq')}"
+            if entry.get("prev_hash") != expected_prev:
+                return checked, f"line {line_number}: chain broken, prev_hash does not match entry {expected_seq - 1}"
+            if audit_entry_hash(entry) != entry.get("hash"):
+                return checked, f"line {line_number}: entry {expected_seq} contents do not match its hash"
+            expected_prev = entry["hash"]
+            expected_seq += 1
+            checked += 1
+    return checked, None
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else AUDIT_LOG_PATH
+    print(f"🔍 Verifying audit log: {path}")
+    try:
+        checked, error = verify_audit_log(path)
+    except FileNotFoundError:
+        print("❌ Audit log not found")
+        return False
+
+    if error:
+        print(f"❌ Verification failed after {checked} valid entries")
+        print(f"   {error}")
+        return False
+    print(f"✅ Chain intact ({checked} entries)")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)